@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,8 +15,9 @@ class Mapper:
         connectivity (nx.Graph): The graph defining physical qubit connectivity.
         cnots_list (list): A list of CNOT operations (as tuples of qubit indices).
         qubits (int): Total number of qubits in the circuit.
-        l_to_p (list): Mapping from logical to physical qubits.
-        p_to_l (list): Mapping from physical to logical qubits.
+        mappings (np.ndarray): Buffer holding both mappings, l_to_p followed by p_to_l.
+        l_to_p (np.ndarray): Mapping from logical to physical qubits (view on the first half of mappings).
+        p_to_l (np.ndarray): Mapping from physical to logical qubits (view on the second half of mappings).
     """
 
     def __init__(self, connectivity: nx.Graph, cnots_list: list, qubits: int):
@@ -32,37 +34,40 @@ class Mapper:
         self.cnots_list = cnots_list
         self.qubits = qubits
 
+        # Both mappings share a single contiguous buffer
+        self.mappings = np.tile(np.arange(qubits, dtype=np.int32), 2)
         # l_to_p[q] = u <-> logical qubit q is mapped to physical node u
-        self.l_to_p = [i for i in range(qubits)]
+        self.l_to_p = self.mappings[:qubits]
         # p_to_l[u] = q <-> physical node u hosts logical qubit q
-        self.p_to_l = [i for i in range(qubits)]
+        self.p_to_l = self.mappings[qubits:]
         logger.info("Each qubit has been mapped to the node with the same index in the topology")
 
-    def physic_to_logical(self) -> list:
+    def physic_to_logical(self) -> np.ndarray:
         """
         Recomputes the physical-to-logical mapping based on the current logical-to-physical mapping.
 
         Returns:
-            list: Updated p_to_l list where p_to_l[u] = q indicates physical node u hosts logical qubit q.
+            np.ndarray: Updated p_to_l array where p_to_l[u] = q indicates physical node u hosts logical qubit q.
         """
-        for q, v in enumerate(self.l_to_p):
-            self.p_to_l[v] = q
+        # Inverting the permutation is a single scatter: p_to_l[l_to_p[q]] = q
+        self.p_to_l[self.l_to_p] = np.arange(self.qubits, dtype=np.int32)
+        return self.p_to_l
 
-    def get_physic_to_logical(self) -> list:
+    def get_physic_to_logical(self) -> np.ndarray:
         """
         Returns the current mapping from physical qubits to logical qubits.
 
         Returns:
-            list: Mapping list where p_to_l[u] = q.
+            np.ndarray: Mapping array where p_to_l[u] = q.
         """
         return self.p_to_l
 
-    def get_logical_to_physic(self) -> list:
+    def get_logical_to_physic(self) -> np.ndarray:
         """
         Returns the current mapping from logical qubits to physical qubits.
 
         Returns:
-            list: Mapping list where l_to_p[q] = u.
+            np.ndarray: Mapping array where l_to_p[q] = u.
         """
         return self.l_to_p
 
@@ -85,15 +90,14 @@ class Mapper:
             connectivity (nx.Graph): A graph representing physical qubit connectivity.
             cnots_list (list): List of CNOT gate pairs (logical qubit indices).
             qubits (int): Number of qubits.
-            l_to_p (list): Predefined logical-to-physical mapping.
-            p_to_l (list): Predefined physical-to-logical mapping.
+            l_to_p (array-like): Predefined logical-to-physical mapping.
+            p_to_l (array-like): Predefined physical-to-logical mapping.
 
         Returns:
             Mapper: An instance of Mapper initialized with the given mappings.
         """
         mapper = Mapper(connectivity, cnots_list, qubits)
-        mapper.l_to_p = l_to_p.copy()
-        mapper.p_to_l = p_to_l.copy()
+        mapper.mappings[:] = np.concatenate((l_to_p, p_to_l))
         logger.info("Initialized a mapper from a pre-computed mapping")
         logger.info("Logical to physical mapping: %s", l_to_p)
         logger.info("Physical to logical mapping: %s", p_to_l)
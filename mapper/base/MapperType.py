@@ -21,27 +21,6 @@ class MapperType(Enum):
     MAJORITY = "MAJORITY MAPPER"
     MAX_PAIRS = "MAX PAIRS MAPPER"
 
-    @staticmethod
-    def __type_from_string(strategy_name: str):
-        """
-        Internal helper method that maps a string to a corresponding MapperType enum.
-
-        Args:
-            strategy_name (str): Name of the strategy (e.g., 'random', 'majority').
-
-        Returns:
-            MapperType: Enum value corresponding to the given strategy name.
-        """
-        match strategy_name.lower():
-            case "random":
-                return MapperType.RANDOM
-            case "majority":
-                return MapperType.MAJORITY
-            case "max_pairs":
-                return MapperType.MAX_PAIRS
-            case _:
-                return MapperType.BASIC 
-
     @staticmethod
     def mapper_from_string(strategy_name: str, connectivity: nx.Graph, cnots_list: list, qubits: int):
         """
@@ -57,16 +36,15 @@ class MapperType(Enum):
             Mapper: An instance of a subclass of Mapper implementing the desired strategy.
         """
         logger.info("Getting mapper for strategy %s", strategy_name)
-        type = MapperType.__type_from_string(strategy_name.lower())
-
-        match type:
-            case MapperType.BASIC:
-                return Mapper(connectivity, cnots_list, qubits)
-            case MapperType.RANDOM:
-                return RandomMapper(connectivity, cnots_list, qubits)
-            case MapperType.MAJORITY:
-                return MajorityMapper(connectivity, cnots_list, qubits)
-            case MapperType.MAX_PAIRS:
-                return MaxInteractingPairsMapping(connectivity, cnots_list, qubits)
-            case _:
-                return Mapper(connectivity, cnots_list, qubits)
\ No newline at end of file
+        # Unknown strategy names fall back to the basic mapper
+        _, mapper_class = _STRATEGIES.get(strategy_name.lower(), _STRATEGIES["basic"])
+        return mapper_class(connectivity, cnots_list, qubits)
+
+
+# Strategy name -> (MapperType, Mapper subclass implementing it)
+_STRATEGIES = {
+    "basic": (MapperType.BASIC, Mapper),
+    "random": (MapperType.RANDOM, RandomMapper),
+    "majority": (MapperType.MAJORITY, MajorityMapper),
+    "max_pairs": (MapperType.MAX_PAIRS, MaxInteractingPairsMapping),
+}
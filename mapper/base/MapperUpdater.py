@@ -1,6 +1,7 @@
 from mapper.base.Mapper import Mapper
 from router.Router import Router
 import networkx as nx
+import numpy as np
 
 import logging
 logger = logging.getLogger(__name__)
@@ -16,6 +17,8 @@ class MapperUpdater:
         self.initial_mapper = mapper
         self.topology = topology 
         self.cnots_list = cnots_list
+        # On trees shortest paths are unique, so re-routing from the final mapping rarely helps
+        self.is_tree = topology.number_of_nodes() > 0 and nx.is_tree(topology)
 
     def update_mapping(self):
         # routes self.cnots_list using self.mapper initial map
@@ -27,12 +30,28 @@ class MapperUpdater:
         swaps_count, _= self.router.route_circuit()
         
         logger.info("Routing with initial mapping completed, obtained %d swaps", swaps_count)
+
+        # A second round can only improve things if the first one moved some qubit
+        if swaps_count == 0:
+            logger.info("No swap was required. Keeping the mapping as it is")
+            return self.initial_mapper
+
         logger.info("Logical to physical mapping after the routing: %s", self.router.l_to_p)
         logger.info("Physical to logical mapping after the routing: %s", self.router.p_to_l)
+
+        if self.is_tree and self.router.lookahead <= 1:
+            logger.info("The topology is a tree and no lookahead is used. Keeping the mapping as it is")
+            return self.initial_mapper
+
+        if np.array_equal(self.router.l_to_p, self.initial_mapper.l_to_p):
+            logger.info("The routing ended in the initial mapping. Keeping the mapping as it is")
+            return self.initial_mapper
+
         logger.info("Using such mappings as initial mappings for a new routing step")
 
         new_mapper = Mapper.from_static_mapping(self.topology, self.cnots_list, self.topology.number_of_nodes(), self.router.l_to_p, self.router.p_to_l)
-        new_router = Router(self.topology, new_mapper, self.cnots_list, self.router.lookahead)
+        # The topology does not change between the two rounds: reuse its shortest paths
+        new_router = Router(self.topology, new_mapper, self.cnots_list, self.router.lookahead, self.router.topology)
         
         new_swaps_count, _ = new_router.route_circuit()
 
@@ -1,7 +1,8 @@
 from mapper.base.Mapper import Mapper
 import networkx as nx
-from mapper.majority.utils import MaxHeap 
-from mapper.majority.utils import KeyValMaxHeapObj
+import numpy as np
+from scipy.sparse import csr_matrix
+import heapq
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,11 +14,19 @@ class MajorityMapper(Mapper):
     This strategy involves sorting the logical qubits by the number of interactions (CNOT operations) and
     sorting the physical qubits by their number of neighbors in the connectivity graph. The qubit with the
     most interactions is mapped to the physical node with the most neighbors.
+
+    Priorities are kept up to date while the mapping is built: a qubit only counts the interactions with
+    qubits that are yet to be mapped, and a node only counts its free neighbors. The heaps use lazy deletion,
+    i.e. a new entry is pushed whenever a priority decreases and outdated entries are skipped when popped.
     
     Attributes:
-        interact (list): A list of sets where interact[i] contains the qubits that logical qubit i interacts with.
-        heap (MaxHeap): A max heap used to prioritize qubits based on the number of interactions.
-        graph_neighbours_heap (MaxHeap): A max heap used to prioritize physical qubits based on the number of neighbors.
+        interact (csr_matrix): Sparse interaction graph, interact[i, j] is the number of CNOTs between logical qubits i and j.
+            The qubits that i interacts with are interact.indices[interact.indptr[i]:interact.indptr[i + 1]].
+        interactions (np.ndarray): interactions[i] is the number of distinct qubits that logical qubit i interacts with.
+        unmapped_interactions (np.ndarray): unmapped_interactions[i] is the number of (yet to be mapped) qubits that i interacts with.
+        free_neighbours (np.ndarray): free_neighbours[u] is the number of free neighbors of physical node u.
+        heap (list): A heap of (-interactions, qubit) pairs used to prioritize qubits based on the number of interactions.
+        graph_neighbours_heap (list): A heap of (-neighbours, node) pairs used to prioritize physical qubits based on the number of neighbors.
     """
 
     def __init__(self, connectivity: nx.Graph, cnots_list: list, qubits: int):
@@ -32,27 +41,29 @@ class MajorityMapper(Mapper):
         super().__init__(connectivity, cnots_list, qubits)  # Initialize the base Mapper class
         logger.info("Computing majority mapping between logical to physical qubits")
         
-        # Initialize interactions for each logical qubit
-        self.interact = [set() for _ in range(qubits)]  # interact[i] = the set of qubits i interacts with
-        for (i, j, _) in cnots_list:
-            self.interact[i].add(j)
-            self.interact[j].add(i)
+        # Build the (symmetric) interaction graph of the logical qubits
+        pairs = np.asarray([(i, j) for (i, j, _) in cnots_list], dtype=np.int32).reshape(-1, 2)
+        rows = np.concatenate((pairs[:, 0], pairs[:, 1]))
+        cols = np.concatenate((pairs[:, 1], pairs[:, 0]))
+        # Repeated CNOTs between the same qubits are summed up into a single entry
+        self.interact = csr_matrix((np.ones_like(rows), (rows, cols)), shape=(qubits, qubits))
+        self.interactions = np.diff(self.interact.indptr)
 
         # Create a max heap for logical qubits based on the number of interactions
-        self.heap = MaxHeap()
-        for q in range(qubits):
-            pair = KeyValMaxHeapObj(q, len(self.interact[q]))  # pair = (logical qubit, number of interactions)
-            self.heap.heappush(pair)  # Push the qubit onto the heap with its interaction count
+        # Keys are negated since heapq implements a min heap
+        self.unmapped_interactions = self.interactions.astype(np.int32)
+        self.heap = list(zip((-self.interactions).tolist(), range(qubits)))
+        heapq.heapify(self.heap)
 
         # Create a max heap for physical qubits based on the number of neighbors in the connectivity graph
-        self.graph_neighbours_heap = MaxHeap()
-        connectivity_nodes_neighbour_size = [
-            KeyValMaxHeapObj(u, len(list(self.connectivity.adj(u)))) for u in list(self.connectivity.nodes)
-        ]
-
-        # Push each physical qubit and its neighbor count onto the heap
-        for el in connectivity_nodes_neighbour_size:
-            self.graph_neighbours_heap.heappush(el)
+        n = self.connectivity.number_of_nodes()
+        nodes = np.fromiter(self.connectivity.nodes, dtype=np.int32, count=n)
+        # degrees[k] = number of neighbours of nodes[k] (degree() follows the same node order)
+        degrees = np.fromiter((degree for _, degree in self.connectivity.degree()), dtype=np.int32, count=n)
+        self.free_neighbours = np.zeros(n, dtype=np.int32)
+        self.free_neighbours[nodes] = degrees
+        self.graph_neighbours_heap = list(zip((-degrees).tolist(), nodes.tolist()))
+        heapq.heapify(self.graph_neighbours_heap)
         
         # Compute the initial mapping between logical and physical qubits
         self.compute_mapping()
@@ -60,6 +71,40 @@ class MajorityMapper(Mapper):
         logger.info("Initial Physic to Logic mapping: %s", self.p_to_l)
 
 
+    @staticmethod
+    def __pop_max(heap: list, priorities: np.ndarray, taken: np.ndarray) -> int:
+        """
+        Pops the key with the highest up-to-date priority, skipping outdated heap entries.
+
+        Args:
+            heap (list): A heap of (-priority, key) pairs.
+            priorities (np.ndarray): The current priority of each key.
+            taken (np.ndarray): Boolean mask of the keys that have already been popped.
+
+        Returns:
+            int: The key with the highest current priority.
+        """
+        while True:
+            neg_priority, key = heapq.heappop(heap)
+            if not taken[key] and -neg_priority == priorities[key]:
+                return key
+
+    @staticmethod
+    def __decrease_priorities(heap: list, priorities: np.ndarray, taken: np.ndarray, keys: np.ndarray):
+        """
+        Decrements the priority of the given keys that have not been popped yet, pushing their new entries.
+
+        Args:
+            heap (list): A heap of (-priority, key) pairs.
+            priorities (np.ndarray): The current priority of each key, updated in place.
+            taken (np.ndarray): Boolean mask of the keys that have already been popped.
+            keys (np.ndarray): The keys whose priority decreases by one.
+        """
+        keys = keys[~taken[keys]]
+        priorities[keys] -= 1
+        for priority, key in zip(priorities[keys].tolist(), keys.tolist()):
+            heapq.heappush(heap, (-priority, key))
+
     def compute_mapping(self):
         """
         Computes the mapping between logical qubits and physical qubits using the majority strategy.
@@ -68,22 +113,35 @@ class MajorityMapper(Mapper):
         and maps it to the physical node with the most neighbors.
         
         """
+        # Checked once: skips building log records in the loop when INFO is disabled
+        log_info = logger.isEnabledFor(logging.INFO)
+
+        mapped = np.zeros(self.qubits, dtype=bool)  # mapped[q] <-> logical qubit q has been mapped
+        occupied = np.zeros(len(self.free_neighbours), dtype=bool)  # occupied[u] <-> node u hosts some qubit
+
         for _ in range(self.qubits): 
             # Pop the qubit with the most interactions
-            qubit_heap_max = self.heap.heappop()
+            qubit = MajorityMapper.__pop_max(self.heap, self.unmapped_interactions, mapped)
             # Pop the physical node with the most neighbors
-            node_heap_max = self.graph_neighbours_heap.heappop()
-
-            qubit = qubit_heap_max.key
-            node = node_heap_max.key
+            node = MajorityMapper.__pop_max(self.graph_neighbours_heap, self.free_neighbours, occupied)
 
             # Log information about the selected qubit and node
-            logger.info("The (yet to be mapped) qubit that interacts with the greater amount of other qubits is %d", qubit)
-            logger.info("The free node with the greater amount of neighbours is %d", node)
+            if log_info:
+                logger.info("The (yet to be mapped) qubit that interacts with the greater amount of other qubits is %d", qubit)
+                logger.info("The free node with the greater amount of neighbours is %d", node)
 
             # Perform the mapping
             self.l_to_p[qubit] = node
             self.p_to_l[node] = qubit
+            mapped[qubit] = True
+            occupied[node] = True
+
+            # The qubits interacting with qubit, and the neighbours of node, lose one candidate each
+            qubit_partners = self.interact.indices[self.interact.indptr[qubit]:self.interact.indptr[qubit + 1]]
+            MajorityMapper.__decrease_priorities(self.heap, self.unmapped_interactions, mapped, qubit_partners)
+            node_neighbours = np.fromiter(self.connectivity.neighbors(node), dtype=np.int32)
+            MajorityMapper.__decrease_priorities(self.graph_neighbours_heap, self.free_neighbours, occupied, node_neighbours)
 
             # Log the mapping
-            logger.info("Mapping qubit %d to node %d", qubit, node)
\ No newline at end of file
+            if log_info:
+                logger.info("Mapping qubit %d to node %d", qubit, node)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from mapper.base.Mapper import Mapper
 import networkx as nx
+from collections import deque
 from mapper.max_interacting_pairs.utils.QubitInteractionsHandler import QubitInteractionsHandler
 from mapper.max_interacting_pairs.utils.FreeTopologyNodesHandler import FreeTopologyNodesHandler
 import logging 
@@ -28,8 +29,8 @@ class MaxInteractingPairsMapping(Mapper):
         """
         super().__init__(connectivity, cnots_list, qubits)
         logger.info("Computing max interacting pairs mapping between logical and physical qubits")
-        self.l_to_p = [-1 for _ in range(qubits)]  # Mapping from logical qubits to physical qubits
-        self.p_to_l = [-1 for _ in range(qubits)]  # Mapping from physical qubits to logical qubits
+        self.l_to_p.fill(-1)  # Mapping from logical qubits to physical qubits
+        self.p_to_l.fill(-1)  # Mapping from physical qubits to logical qubits
         self.compute_mapping()  # Computes the initial mapping
         logger.info("Initial Logic to Physic mapping: %s", self.l_to_p)
         logger.info("Initial Physic to Logic mapping: %s", self.p_to_l)
@@ -53,30 +54,37 @@ class MaxInteractingPairsMapping(Mapper):
         # 2. Graph Topology handler
         topology_handler = FreeTopologyNodesHandler(self.connectivity)
 
-        # 3. List of next in queue qubits/nodes to handle
-        queue = []
+        # 3. Queue of next in line qubits/nodes to handle
+        queue = deque()
 
         # 4. What is left?
         to_do = self.qubits
 
+        # Checked once: skips building log records in the loop when INFO is disabled
+        log_info = logger.isEnabledFor(logging.INFO)
+
         while to_do != 0:
             if len(queue) == 0:  # if no old result must be handled
-                logger.info("No previous pair was left to be handled. Picking a fresh pair node-qubit with the max-interacting-pairs strategy")
+                if log_info:
+                    logger.info("No previous pair was left to be handled. Picking a fresh pair node-qubit with the max-interacting-pairs strategy")
                 
                 # 5.1. Pick the free node with the greater amount of free neighbours
                 node, node_neighbours = topology_handler.free_node_with_most_free_neighbours()
-                logger.info("The free node with the greater number of free neighbours is %d", node)
-                logger.info("Such node has %d free neighbours", len(node_neighbours))
+                if log_info:
+                    logger.info("The free node with the greater number of free neighbours is %d", node)
+                    logger.info("Such node has %d free neighbours", len(node_neighbours))
 
                 # 5.2. Find the (not mapped) qubit that maximises the number of interactions with d qubits 
                 qubit, qubit_neighbours = qubit_interactions.qubit_with_most_d_interactions(len(node_neighbours))
-                logger.info("The qubit that maximise the number of interactions with other %d qubits is: %d", len(node_neighbours), qubit)
-                logger.info("Such qubit interacts with other %d (yet to be mapped) qubits", len(qubit_neighbours))
+                if log_info:
+                    logger.info("The qubit that maximise the number of interactions with other %d qubits is: %d", len(node_neighbours), qubit)
+                    logger.info("Such qubit interacts with other %d (yet to be mapped) qubits", len(qubit_neighbours))
 
                 # 5.3. Store the mapping
                 self.l_to_p[qubit] = node 
                 self.p_to_l[node] = qubit
-                logger.info("Mapping qubit %d to node %d", qubit, node)
+                if log_info:
+                    logger.info("Mapping qubit %d to node %d", qubit, node)
 
                 to_do -= 1
 
@@ -85,17 +93,17 @@ class MaxInteractingPairsMapping(Mapper):
                 qubit_interactions.map_qubit(qubit)
 
             else:  # handling nodes coming from previous iterations
-                node = queue[0][0]
-                qubit = queue[0][1]
-                logger.info("A pair qubit-node was left to be handled from some previous iteration.")
-                logger.info("Current handled pair is qubit: %d, node: %d", qubit, node)
-
-                queue = queue[1:]  # removing 
+                node, qubit = queue.popleft()
+                if log_info:
+                    logger.info("A pair qubit-node was left to be handled from some previous iteration.")
+                    logger.info("Current handled pair is qubit: %d, node: %d", qubit, node)
 
                 node_neighbours = topology_handler.get_free_neighbours(node)
-                logger.info("Node %d has %d free neighbours", node, len(neighbour_neighbours))
+                if log_info:
+                    logger.info("Node %d has %d free neighbours", node, len(node_neighbours))
                 qubit_neighbours = qubit_interactions.d_interactions(qubit, len(node_neighbours))
-                logger.info("It interacts with %d (yet to be mapped) qubits", len(qubit_neighbours))
+                if log_info:
+                    logger.info("It interacts with %d (yet to be mapped) qubits", len(qubit_neighbours))
             
             # This could be removed...
             iters = min(len(qubit_neighbours), len(node_neighbours))
@@ -103,13 +111,15 @@ class MaxInteractingPairsMapping(Mapper):
             for i in range(iters):
                 # 5.5. Pick the node, between node_neighbours, with bigger amount free neighbours
                 neighbour, neighbour_neighbours = topology_handler.node_with_most_free_neighbours_set(node_neighbours)
-                logger.info("The free neighbour of %d with the greater amount of free neighbours is %d", node, neighbour)
-                logger.info("It has %d free neighbours", len(neighbour_neighbours))
+                if log_info:
+                    logger.info("The free neighbour of %d with the greater amount of free neighbours is %d", node, neighbour)
+                    logger.info("It has %d free neighbours", len(neighbour_neighbours))
 
                 # 5.6. map neighbour to the qubit, between qubit_neighbours, that maximizes the number of len(neighbour_neighbours) interactions
                 neighbour_qubit, neighbour_qubit_interactions = qubit_interactions.qubit_with_most_d_interactions_from_set(len(neighbour_neighbours), qubit_neighbours)
-                logger.info("The (yet to be mapped) qubit that maximise the number of interactions with other %d qubits is %d. Note that %d is picked only between the qubits interacting with %d",  len(neighbour_neighbours), neighbour_qubit, neighbour_qubit, qubit)
-                logger.info("It interacts with %d (yet to be mapped) qubits", len(neighbour_qubit_interactions))
+                if log_info:
+                    logger.info("The (yet to be mapped) qubit that maximise the number of interactions with other %d qubits is %d. Note that %d is picked only between the qubits interacting with %d",  len(neighbour_neighbours), neighbour_qubit, neighbour_qubit, qubit)
+                    logger.info("It interacts with %d (yet to be mapped) qubits", len(neighbour_qubit_interactions))
 
                 if qubit != -1:
                     qubit_interactions.map_qubit(neighbour_qubit)
@@ -118,12 +128,13 @@ class MaxInteractingPairsMapping(Mapper):
                     # 5.7. Store mapping 
                     self.l_to_p[neighbour_qubit] = neighbour
                     self.p_to_l[neighbour] = neighbour_qubit
-                    logger.info("Mapping qubit %d to node %d", neighbour_qubit, neighbour)
+                    if log_info:
+                        logger.info("Mapping qubit %d to node %d", neighbour_qubit, neighbour)
 
                     to_do -= 1
 
                     # 5.8. Update structures
-                    node_neighbours.discard(neighbour)
+                    node_neighbours = node_neighbours[node_neighbours != neighbour]
                     qubit_neighbours.discard(neighbour_qubit)
 
                     # 5.9. Recall that the next iterations must handle the neighbours of node first
@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 
 class FreeTopologyNodesHandler:
     """
@@ -9,10 +10,13 @@ class FreeTopologyNodesHandler:
     - Finding the node with the most free neighbors.
     - Marking nodes as occupied and updating the neighbors' free status accordingly.
 
+    Nodes are assumed to be labeled from 0 to n-1, so that they can be used to index NumPy arrays.
+
     Attributes:
-        nodes (dict): The nodes in the graph.
-        free_nodes (set): A set of nodes that are currently free.
-        free_neighbours (list): A list of sets where each set contains the free neighbors of a corresponding node.
+        adj (np.ndarray): An n x n uint8 adjacency bitmap, adj[u, v] = 1 iff u and v are neighbours and v is free.
+        free (np.ndarray): A uint8 vector where free[v] = 1 iff node v is currently free.
+        free_degree (np.ndarray): An int32 vector where free_degree[v] is the number of free neighbours of v.
+        neighbours (list): neighbours[v] is the array of all the neighbours of v in the topology, free or not.
     """
 
     def __init__(self, graph: nx.Graph):
@@ -22,38 +26,43 @@ class FreeTopologyNodesHandler:
         Args:
             graph (nx.Graph): A networkx graph representing the topology, where nodes can be marked as free or occupied.
         """
-        self.nodes = graph.nodes  # Store the nodes of the graph
-        self.free_nodes = set([u for u in graph.nodes])  # Initialize all nodes as free
-        self.free_neighbours = [set() for _ in graph.nodes]  # Initialize an empty set for each node's free neighbors
+        n = graph.number_of_nodes()
+        self.adj = np.zeros((n, n), dtype=np.uint8)  # Adjacency bitmap of the topology
+        self.free = np.ones(n, dtype=np.uint8)  # Initialize all nodes as free
+
+        # Populate the adjacency bitmap with a single symmetric scatter over the edges
+        edges = np.asarray(list(graph.edges), dtype=np.int32).reshape(-1, 2)
+        self.adj[edges[:, 0], edges[:, 1]] = 1
+        self.adj[edges[:, 1], edges[:, 0]] = 1
 
-        # Populate the free_neighbours list with the neighbors of each node
-        # This optimization helps in quickly finding the neighbors of free nodes
-        for v in graph.nodes:
-            for u in graph.neighbors(v):
-                self.free_neighbours[v].add(u)  # Add u as a free neighbor of v
+        # Initially every neighbour is free
+        self.free_degree = self.adj.sum(axis=1, dtype=np.int32)
+        # Occupying a node only affects its neighbours: keep them at hand
+        self.neighbours = [np.flatnonzero(row) for row in self.adj]
 
     def node_with_most_free_neighbours_set(self, nodes):
         """
-        Finds the node with the most free neighbors from a given set of nodes.
+        Finds the node with the most free neighbors from a given array of nodes.
+        Ties go to the node that comes first in `nodes`, i.e. to the lowest node when nodes are sorted.
 
         Args:
-            nodes (iterable): A collection of nodes to check.
+            nodes (np.ndarray): An array of nodes to check.
 
         Returns:
             tuple: The node with the most free neighbors and its free neighbors.
         """
-        # Select the node with the most free neighbors using a max function
-        node, _ = max([(v, len(self.free_neighbours[v])) for v in nodes], key=lambda el: el[1])
+        # Free neighbours are counted incrementally, so picking the best candidate is a single scan
+        node = int(nodes[np.argmax(self.free_degree[nodes])])
         return node, self.get_free_neighbours(node)  # Return the node and its free neighbors
 
     def free_node_with_most_free_neighbours(self):
         """
-        Finds the free node with the most free neighbors.
+        Finds the free node with the most free neighbors, the lowest one in case of ties.
 
         Returns:
             tuple: The free node with the most free neighbors and its free neighbors.
         """
-        return self.node_with_most_free_neighbours_set(self.free_nodes)
+        return self.node_with_most_free_neighbours_set(np.flatnonzero(self.free))
 
     def get_free_neighbours(self, v):
         """
@@ -63,9 +72,9 @@ class FreeTopologyNodesHandler:
             v (node): The node for which to retrieve the free neighbors.
 
         Returns:
-            set: A set of free neighbors for the node v.
+            np.ndarray: An array with the free neighbors of the node v.
         """
-        return self.free_neighbours[v]
+        return np.flatnonzero(self.adj[v] & self.free)
 
     def occupy_node(self, v):
         """
@@ -74,8 +83,8 @@ class FreeTopologyNodesHandler:
         Args:
             v (node): The node to occupy.
         """
-        # Remove the node v from the set of free nodes
-        self.free_nodes.remove(v)
-        # Update the free neighbors of other nodes to reflect that v is now occupied
-        for w in self.nodes:
-            self.free_neighbours[w].discard(v)  # Remove v from the free neighbors of all other nodes
\ No newline at end of file
+        # v is no longer a free neighbour of any node, nor a free node itself
+        neighbours = self.neighbours[v]
+        self.free_degree[neighbours] -= 1
+        self.adj[neighbours, v] = 0
+        self.free[v] = 0
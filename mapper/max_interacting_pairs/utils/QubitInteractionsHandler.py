@@ -1,3 +1,5 @@
+import numpy as np
+
 class QubitInteractionsHandler:
     """
     This class handles the interactions between qubits in a quantum circuit, tracking how many interactions 
@@ -10,9 +12,10 @@ class QubitInteractionsHandler:
 
     Attributes:
         qubits (int): Total number of qubits.
-        n (range): A range object representing qubit indices.
-        free_qubits (set): A set of qubits that are still free (unmapped).
-        interactions_count (list of lists): A 2D matrix storing the number of interactions between each pair of qubits.
+        free_mask (np.ndarray): Boolean mask of the qubits that are still free (unmapped).
+        interactions_count (np.ndarray): A 2D matrix storing the number of interactions between each pair of qubits.
+        sorted_neighbours (np.ndarray): Row i lists all of the qubits by decreasing number of interactions with qubit i.
+        sorted_counts (np.ndarray): sorted_counts[i, k] is the number of interactions between i and sorted_neighbours[i, k].
     """
 
     def __init__(self, cnots_list: list, qubits: int):
@@ -24,41 +27,37 @@ class QubitInteractionsHandler:
             qubits (int): The total number of qubits in the circuit.
         """
         self.qubits = qubits  # Set the number of qubits
-        self.n = range(self.qubits)  # Create a range object for qubit indices
+        self.free_mask = np.ones(self.qubits, dtype=bool)  # Initially, all qubits are free
 
-        self.free_qubits = set([q for q in self.n])  # Initially, all qubits are free
+        # Count the interactions between qubits based on the CNOT list, in both directions,
+        # with a single histogram over the flat indices i * qubits + j of the (symmetric) matrix
+        pairs = np.asarray([(i, j) for (i, j, _) in cnots_list], dtype=np.intp).reshape(-1, 2)
+        flat = np.concatenate((pairs[:, 0] * self.qubits + pairs[:, 1], pairs[:, 1] * self.qubits + pairs[:, 0]))
+        counts = np.bincount(flat, minlength=self.qubits * self.qubits)
+        self.interactions_count = counts.astype(np.int32).reshape(self.qubits, self.qubits)
 
-        # Initialize a matrix to store interaction counts between qubits
-        self.interactions_count = [[0 for _ in self.n] for _ in self.n]
-        # Populate the interaction counts based on the CNOT list
-        for (i, j, _) in cnots_list:
-            self.interactions_count[i][j] += 1
-            self.interactions_count[j][i] += 1
+        # Interactions never change: sort each row once, by decreasing interaction count
+        # The sort is stable, so ties are kept in increasing qubit order
+        self.sorted_neighbours = np.argsort(-self.interactions_count, axis=1, kind="stable")
+        self.sorted_counts = np.take_along_axis(self.interactions_count, self.sorted_neighbours, axis=1)
 
-    def __get_first_d_free_non_zero(self, d, list):
+    def __get_first_d_free_non_zero(self, d, qubit):
         """
-        Finds the first d free qubits from a sorted list of qubits and their interaction counts 
-        that have non-zero interactions.
+        Finds the first d free qubits, among the ones sorted by decreasing number of interactions with qubit,
+        that have non-zero interactions with it. If d <= 0, all of them are returned.
 
         Args:
             d (int): The number of qubits to find.
-            list (list): A sorted list of tuples (qubit, interaction_count) sorted by interaction_count in descending order.
+            qubit (int): The qubit whose sorted interactions are scanned.
 
         Returns:
             set: A set of qubits with the most interactions that are still free.
         """
-        result = set()  # Initialize an empty set to store the result
-        found = 0  # Track how many free qubits have been found
-        for qubit, interactions in list:
-            if interactions == 0:  # Stop if interactions count reaches zero
-                break
-            if qubit in self.free_qubits:  # Only consider free qubits
-                result.add(qubit)
-                found += 1
-                if found == d:  # Stop once we've found d qubits
-                    break
-        
-        return result
+        neighbours = self.sorted_neighbours[qubit]
+        # Counts are sorted in descending order, so the non-zero ones are a prefix of the row
+        candidates = neighbours[(self.sorted_counts[qubit] > 0) & self.free_mask[neighbours]]
+        # As the original scan (which stopped once d qubits were found), d <= 0 sets no limit
+        return set((candidates[:d] if d > 0 else candidates).tolist())
 
     def d_interactions(self, qubit, d):
         """
@@ -71,14 +70,8 @@ class QubitInteractionsHandler:
         Returns:
             set: A set of d qubits that interact the most with the specified qubit.
         """
-        # Create a list of pairs (qubit, interaction_count) for the specified qubit
-        interactions_count_pairs = [(j, self.interactions_count[qubit][j]) for j in self.n]
-
-        # Sort the list by interaction count in descending order
-        interactions_count_pairs.sort(key=lambda e: e[1], reverse=True) 
-        
         # Return the first d free qubits with non-zero interactions
-        return self.__get_first_d_free_non_zero(d, interactions_count_pairs)
+        return self.__get_first_d_free_non_zero(d, qubit)
     
     def qubit_with_most_d_interactions_from_set(self, d: int, target_qubits):
         """
@@ -86,39 +79,25 @@ class QubitInteractionsHandler:
 
         Args:
             d (int): The number of interactions to consider.
-            target_qubits (set): A set of qubits to consider.
+            target_qubits (Iterable[int]): The qubits to consider.
 
         Returns:
             tuple: The qubit with the most interactions and its d most-interacting neighbors.
         """
-        # Create a list of interactions for each qubit
-        interactions_count_pairs = [[(j, self.interactions_count[i][j]) for j in self.n] for i in self.n]
-
-        # Sort each qubit's interaction list by interaction count in descending order
-        for i in self.n:
-            interactions_count_pairs[i].sort(key=lambda e: e[1], reverse=True)
-
-        # Track the qubit with the highest sum of interactions with the top d neighbors
-        max_i = -1
-        max_val = -1
-
-        for i in self.n:
-            if i in target_qubits:
-                total_interactions = 0
-                # Sum the interactions with the first d free neighbors
-                for k in range(d):
-                    if interactions_count_pairs[i][k][0] in self.free_qubits:
-                        total_interactions += interactions_count_pairs[i][k][1]
+        # Scan the targets in increasing order, so that ties go to the smallest qubit
+        targets = np.sort(np.fromiter(target_qubits, dtype=np.int32, count=len(target_qubits)))
+        if targets.size == 0:
+            return -1, set()
 
-                if total_interactions > max_val:
-                    max_i = i
-                    max_val = total_interactions
+        # Sum, for each target, the interactions with the free qubits among its top d neighbours
+        top_neighbours = self.sorted_neighbours[targets, :d]
+        total_interactions = (self.sorted_counts[targets, :d] * self.free_mask[top_neighbours]).sum(axis=1)
 
         # The candidate qubit with the most interactions
-        candidate = max_i
+        candidate = int(targets[np.argmax(total_interactions)])
 
         # Get the d most-interacting neighbors of the candidate qubit
-        candidate_d_neighbours = self.__get_first_d_free_non_zero(d, interactions_count_pairs[candidate])
+        candidate_d_neighbours = self.__get_first_d_free_non_zero(d, candidate)
         
         return candidate, candidate_d_neighbours
 
@@ -132,15 +111,14 @@ class QubitInteractionsHandler:
         Returns:
             tuple: The qubit with the most interactions and its d most-interacting neighbors.
         """
-        return self.qubit_with_most_d_interactions_from_set(d, self.free_qubits)
+        return self.qubit_with_most_d_interactions_from_set(d, np.flatnonzero(self.free_mask))
     
     def map_qubit(self, q: int):
         """
-        Marks a qubit as mapped, removing it from the set of free qubits.
+        Marks a qubit as mapped, removing it from the free qubits.
 
         Args:
             q (int): The qubit to map (mark as occupied).
         """
-        if q not in self.n:  # Ensure the qubit index is valid
-            return
-        self.free_qubits.discard(q)  # Remove the qubit from the set of free qubits
\ No newline at end of file
+        if 0 <= q < self.qubits:  # Ensure the qubit index is valid
+            self.free_mask[q] = False
\ No newline at end of file
@@ -1,5 +1,6 @@
 from mapper.base.Mapper import Mapper
 import networkx as nx
+import numpy as np
 import random as rnd
 import logging
 
@@ -28,15 +29,19 @@ class RandomMapper(Mapper):
         logger.info("Initial Logic to Physic mapping: %s", self.l_to_p)
         logger.info("Initial Physic to Logic mapping: %s", self.p_to_l)
 
-    def compute_mapping(self) -> list:
+    def compute_mapping(self) -> np.ndarray:
         """
         Computes a random permutation of the logical-to-physical mapping.
 
-        This method modifies `self.l_to_p` in-place using random shuffling,
+        This method overwrites `self.l_to_p` in-place with a random permutation,
         and updates the reverse mapping (`self.p_to_l`) accordingly.
 
         Returns:
-            list: The updated logical-to-physical mapping.
+            np.ndarray: The updated logical-to-physical mapping.
         """
-        rnd.shuffle(self.l_to_p)  # randomly shuffling qubits to nodes
-        self.physic_to_logical()  # update reverse mapping
\ No newline at end of file
+        # Shuffled as a list of ints (cheaper than swapping NumPy scalars), with the random module like the rest of the routing
+        nodes = list(range(self.qubits))
+        rnd.shuffle(nodes)  # randomly assigning qubits to nodes
+        self.l_to_p[:] = nodes
+        self.physic_to_logical()  # update reverse mapping (a single vectorized scatter)
+        return self.l_to_p
\ No newline at end of file
@@ -1,12 +1,39 @@
 from mapper.base.Mapper import Mapper
 from router.utils.UnweightedUndirectedGraph import UnweightedUndirectedGraph
+from router.utils.jit import HAS_NUMBA
 import networkx as nx
-from math import ceil
-from random import choice
+import numpy as np
+from functools import lru_cache
+from random import randrange
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Number of CNOTs from which routing is done by the compiled kernel. Below it, the Python loop finishes before
+# Numba is imported and the kernel loaded from its on-disk cache (about half a second). Compiling the kernel,
+# when the cache is missing or cannot be written, takes several seconds more
+KERNEL_MIN_CNOTS = 100000
+
+def _processed_topology(topology: nx.Graph) -> UnweightedUndirectedGraph:
+    """
+    Returns the UnweightedUndirectedGraph of `topology`, shared by all routers working on the same topology.
+    Shortest paths computed by previous routers on the same topology are reused as well.
+    The returned graph is marked as shared and refuses any modification.
+    """
+    edges = frozenset(map(frozenset, topology.edges()))
+    return _build_topology(topology.number_of_nodes(), edges)
+
+@lru_cache(maxsize=8)
+def _build_topology(num_nodes: int, edges: frozenset) -> UnweightedUndirectedGraph:
+    """
+    Builds the shared UnweightedUndirectedGraph with the given nodes and edges (each one a frozenset of its endpoints).
+    Cached, so that only the graphs of the most recently used topologies (and their shortest paths) are kept.
+    """
+    graph = UnweightedUndirectedGraph(num_nodes)
+    graph.from_edges([(min(edge), max(edge)) for edge in edges])  # min == max for self loops
+    graph.shared = True
+    return graph
+
 class Router:
     """
     Router class handles the routing of a quantum circuit's CNOT operations
@@ -14,7 +41,7 @@ class Router:
     by analyzing the connectivity of qubits and leveraging lookahead strategies.
     """
     
-    def __init__(self, topology: nx.Graph, mapper : Mapper, cnots_list : list, lookahead : int):
+    def __init__(self, topology: nx.Graph, mapper : Mapper, cnots_list : list, lookahead : int, graph : UnweightedUndirectedGraph = None):
         """
         Initializes the Router with a quantum circuit's CNOTs, the mapping between logical and physical qubits, 
         and the physical topology of the qubits.
@@ -24,9 +51,14 @@ class Router:
             mapper (Mapper): The current mapping between logical qubits and physical qubits.
             cnots_list (list): A list of CNOT operations to be routed.
             lookahead (int): The number of subsequent CNOTs to look ahead in the routing strategy.
+            graph (UnweightedUndirectedGraph, optional): An already processed version of `topology`, along with the shortest paths it has already computed.
+                If not given, the graph cached for `topology` is used (and built the first time). Cached graphs are shared, so they cannot be modified.
         """
-        self.l_to_p = mapper.l_to_p.copy()
-        self.p_to_l = mapper.p_to_l.copy()
+        # Copy both mappings into a single buffer, l_to_p followed by p_to_l
+        qubits = len(mapper.l_to_p)
+        self.mappings = np.concatenate((mapper.l_to_p, mapper.p_to_l)).astype(np.int32, copy=False)
+        self.l_to_p = self.mappings[:qubits]
+        self.p_to_l = self.mappings[qubits:]
 
         logger.info("Creating router with the following initial mapping:")
         logger.info("Logical to physical: %s", mapper.l_to_p)
@@ -34,19 +66,22 @@ class Router:
         logger.info("Routing the following set of CNOTS: %s", cnots_list)
 
         self.cnots_list = cnots_list
+        # (control, target) pairs and lookahead window starts as arrays, for the compiled routing kernel
+        self.cnots_array = np.asarray([(c, t) for (c, t, _) in cnots_list], dtype=np.int32).reshape(-1, 2)
+        self.cnots_begin = np.asarray([i for (_, _, i) in cnots_list], dtype=np.int64)
         self.lookahead = lookahead
-        self.topology = UnweightedUndirectedGraph(topology.number_of_nodes())
-        self.topology.from_nx(topology)
-        self.topology.floyd_warshall()
+        # Whether the per-CNOT DEBUG messages are emitted, refreshed at each routing: skips building log records on the hot path
+        self.log_debug = logger.isEnabledFor(logging.DEBUG)
+        self.topology = graph if graph is not None else _processed_topology(topology)
 
     def get_current_mapping(self):
         """
         Returns the current mapping between logical and physical qubits.
 
         Returns:
-            tuple: A tuple containing two lists:
-                - logical to physical mapping (`l_to_p`)
-                - physical to logical mapping (`p_to_l`)
+            tuple: A tuple containing two np.ndarray (int32 views on `self.mappings`):
+                - logical to physical mapping (`l_to_p`), where l_to_p[q] = u
+                - physical to logical mapping (`p_to_l`), where p_to_l[u] = q
         """
         return self.l_to_p, self.p_to_l
 
@@ -63,28 +98,40 @@ class Router:
         Returns:
             int: A decision on which qubit to move (-1 for both, `control` for control qubit, `target` for target qubit).
         """
-        logger.info("Getting informations on next %d cnots", self.lookahead)
-        logger.info("Will be used to decide whether to move control or target")
+        if self.log_debug:
+            logger.debug("Getting informations on next %d cnots", self.lookahead)
+            logger.debug("Will be used to decide whether to move control or target")
 
-        operations = self.cnots_list[begin:min(begin + self.lookahead, len(self.cnots_list))]
-        control_count = sum([1 for (c, t, _) in operations if c == control or t == control])
-        target_count = sum([1 for (c, t, _) in operations if c == target or t == target])
+        # Count the CNOTs involving control, and the ones involving target, in a single pass over the window
+        control_count = 0
+        target_count = 0
+        for (c, t, _) in self.cnots_list[begin:begin + self.lookahead]:
+            if c == control or t == control:
+                control_count += 1
+            if c == target or t == target:
+                target_count += 1
 
         if control_count == 0 and target_count == 0: 
-            logger.info("Both control and target are not effected by next %d cnots. Randomly picking the strategy", self.lookahead)
-            return choice([control, target, -1])
-        elif control_count == 0 or control_count >= 2*target_count: 
-            logger.info("Since (i) either the control is not used or (ii) used twice with respect to target in the next %d operations", self.lookahead)
-            logger.info("Target qubit will be routed all way to the control")
-            return target
-        elif target_count == 0 or target_count >= 2*control_count:
-            logger.info("Since (i) either the target is not used or (ii) used twice with respect to control in the next %d operations", self.lookahead)
-            logger.info("Control qubit will be routed all way to the target")
-            return control 
-        else:
-            logger.info("Since no particular information have been gathered using the %d subsequent cnots", self.lookahead)
-            logger.info("Half of the path will be done by target and the other half by control")
-            return -1
+            if self.log_debug:
+                logger.debug("Both control and target are not effected by next %d cnots. Randomly picking the strategy", self.lookahead)
+            return (control, target, -1)[randrange(3)]
+
+        # Target moves if control is not used or used twice as much as target, control moves in the symmetric case
+        strategy = (target if control_count == 0 or control_count >= 2*target_count
+                    else control if target_count == 0 or target_count >= 2*control_count
+                    else -1)
+
+        if self.log_debug:
+            if strategy == target:
+                logger.debug("Since (i) either the control is not used or (ii) used twice with respect to target in the next %d operations", self.lookahead)
+                logger.debug("Target qubit will be routed all way to the control")
+            elif strategy == control:
+                logger.debug("Since (i) either the target is not used or (ii) used twice with respect to control in the next %d operations", self.lookahead)
+                logger.debug("Control qubit will be routed all way to the target")
+            else:
+                logger.debug("Since no particular information have been gathered using the %d subsequent cnots", self.lookahead)
+                logger.debug("Half of the path will be done by target and the other half by control")
+        return strategy
             
     def __move_through_path(self, qubit : int, qubit_node : int, path : list):
         """
@@ -99,24 +146,23 @@ class Router:
         Returns:
             tuple: A list of swap operations and the total number of swaps performed.
         """
-        swaps = 0
-        swaps_list = []
-
-        logger.info("Moving qubit %d, mapped to node %d, towards the following path of nodes %s", qubit, qubit_node, path)
+        if self.log_debug:
+            logger.debug("Moving qubit %d, mapped to node %d, towards the following path of nodes %s", qubit, qubit_node, path)
 
+        swaps_list = []
+        l_to_p, p_to_l = self.l_to_p, self.p_to_l
+        # Paths are a few nodes long: scalar updates are cheaper than building index arrays for them
         for node in path:
-            swap_qubit = self.p_to_l[node]
+            swap_qubit = int(p_to_l[node])
             swaps_list.append((qubit, swap_qubit))
-            self.p_to_l[node] = qubit
-            self.p_to_l[qubit_node] = swap_qubit
-            self.l_to_p[qubit] = node
-            self.l_to_p[swap_qubit] = qubit_node 
 
+            p_to_l[node] = qubit
+            p_to_l[qubit_node] = swap_qubit
+            l_to_p[qubit] = node
+            l_to_p[swap_qubit] = qubit_node
             qubit_node = node
 
-            swaps += 1
-            
-        return swaps_list, swaps
+        return swaps_list, len(swaps_list)
 
     def __apply_cnot(self, control : int, target : int, i : int):
         """
@@ -131,7 +177,8 @@ class Router:
         Returns:
             tuple: A list of swaps performed and the total number of swaps required to apply the CNOT.
         """
-        logger.info("Attempt at doing cnot between qubit %d and qubit %d", control, target)
+        if self.log_debug:
+            logger.debug("Attempt at doing cnot between qubit %d and qubit %d", control, target)
         swaps_count = 0
         swaps = []
 
@@ -139,47 +186,48 @@ class Router:
         target_node = self.l_to_p[target]
 
         if self.topology.are_adjacent(control_node, target_node): 
-            logger.info("Qubits %d and %d are adjacent according to their mapping (currently mapped in nodes %d and %d, respectively)", control, target, control_node, target_node)
-            logger.info("No swap required")
+            if self.log_debug:
+                logger.debug("Qubits %d and %d are adjacent according to their mapping (currently mapped in nodes %d and %d, respectively)", control, target, control_node, target_node)
+                logger.debug("No swap required")
             return [], 0
 
-        logger.info("The two nodes in which the qubits are mapped to are not adjacent")
-        logger.info("Using shortest path to move them")
+        if self.log_debug:
+            logger.debug("The two nodes in which the qubits are mapped to are not adjacent")
+            logger.debug("Using shortest path to move them")
 
         shortest_path = self.topology.get_shortest_path(control_node, target_node)
 
         strategy = self.__swap_strategy_by_lookahead(i, control, target)
         
         if strategy == -1:
-            logger.info("Half of the path will be done by control, the remainder by target")
-            shortest_path_len = len(shortest_path) # number of edges
+            if self.log_debug:
+                logger.debug("Half of the path will be done by control, the remainder by target")
+            # Control covers the first half of the edges, target (walking backwards) the remaining ones
+            # but the last: the two qubits end up on the adjacent nodes shortest_path[control_edges] and shortest_path[control_edges + 1]
+            path_edges = len(shortest_path) - 1
+            control_edges = path_edges >> 1
+            if self.log_debug:
+                logger.debug("Control qubit will be moved of %d edges", control_edges)
+                logger.debug("Target qubit will be moved of %d edges", path_edges - 1 - control_edges)
 
-            if shortest_path_len % 2 == 0:
-                control_edges = int(shortest_path_len/2)
-                logger.info("Control qubit will be moved of %d edges", control_edges)
-            else:
-                control_edges = int(ceil(shortest_path_len/2))
-                logger.info("Target qubit will be moved of %d edges", control_edges)
-
-            control_path = shortest_path[:control_edges]
-            target_path = shortest_path[control_edges:]
-
-            control_path = control_path[1:]
-            target_path = target_path[:-1]
+            control_path = shortest_path[1:control_edges + 1]
+            target_path = shortest_path[-2:control_edges:-1]
 
         if strategy == control:
-            logger.info("Move control all the way to target")
+            if self.log_debug:
+                logger.debug("Move control all the way to target")
             control_path = shortest_path[1:-1]
             target_path = []
         
         if strategy == target:
-            logger.info("Move target all the way to control")
+            if self.log_debug:
+                logger.debug("Move target all the way to control")
             control_path = []
-            target_path = shortest_path[1:-1]
-            target_path.reverse()
+            target_path = shortest_path[-2:0:-1]  # Reversed, target moves towards control
 
-        logger.info("Path followed by control qubit is:  %s", control_path)
-        logger.info("Path followed by target qubit is:  %s", target_path)
+        if self.log_debug:
+            logger.debug("Path followed by control qubit is:  %s", control_path)
+            logger.debug("Path followed by target qubit is:  %s", target_path)
 
 
         control_swaps, control_swaps_count = self.__move_through_path(control, control_node, control_path)
@@ -218,12 +266,54 @@ class Router:
                 - swaps (list): A list of swaps made during routing.
         """
         logger.info("Routing the first %d cnots", m)
-        swaps_count = 0
-        swaps = []
+        self.log_debug = logger.isEnabledFor(logging.DEBUG)
+
+        m = min(m, len(self.cnots_list))
+        # The compiled kernel does not log: the Python loop is kept when DEBUG messages are requested
+        if HAS_NUMBA and not self.log_debug and m >= KERNEL_MIN_CNOTS:
+            swaps_count, swaps = self.__route_circuit_portion_compiled(m)
+        else:
+            swaps_count = 0
+            swaps = []
+
+            for c, t, i in self.cnots_list[:m]:
+                new_swaps, new_swaps_count = self.__apply_cnot(c, t, i)
+                swaps.append(new_swaps)
+                swaps_count += new_swaps_count
+
+        logger.info("Routed %d cnots with %d swaps", len(swaps), swaps_count)
+        return swaps_count, swaps
+
+    def __route_circuit_portion_compiled(self, m : int):
+        """
+        Routes the first `m` CNOT operations with the compiled routing kernel. Same behaviour as the Python loop.
+        Random choices only happen when a lookahead window does not start at its own CNOT. In that case the kernel's
+        generator is seeded from the `random` module, so that random.seed makes both paths reproducible (the two
+        paths draw differently, so their choices may differ); otherwise the `random` module is left untouched.
+        
+        Args:
+            m (int): The number of CNOT operations to route.
+        
+        Returns:
+            tuple: A tuple containing:
+                - swaps_count (int): Total number of swaps performed.
+                - swaps (list): A list of swaps made during routing.
+        """
+        from router.routing_kernel import route_cnots  # Imports Numba: only done once the kernel is needed
+
+        # A window starting at its own CNOT involves both of its qubits, so no strategy can be picked at random
+        random_choices = bool(np.any(self.cnots_begin[:m] != np.arange(m)))
+        seed = randrange(2**32) if random_choices else 0
+
+        indptr, indices, dist, next_node, explored = self.topology.get_routing_arrays()
+        swaps_array, routed = route_cnots(self.l_to_p, self.p_to_l, self.cnots_array, self.cnots_begin, m, self.lookahead,
+                                          self.topology.adj_matrix, indptr, indices, dist, next_node, explored, seed)
 
-        for c, t, i in self.cnots_list[:m]:
-            new_swaps, new_swaps_count = self.__apply_cnot(c, t, i)
-            swaps.append(new_swaps)
-            swaps_count += new_swaps_count
+        # Same layout as the Python loop: no entry for adjacent qubits, else [control swaps, target swaps].
+        # Rows are sorted by (cnot, side): bounds[2 * cnot + side] is where the swaps of that side of cnot start
+        pairs = list(zip(swaps_array[:, 2].tolist(), swaps_array[:, 3].tolist()))
+        bounds = np.searchsorted(2 * swaps_array[:, 0] + swaps_array[:, 1], np.arange(2 * m + 1)).tolist()
+        swaps = [[pairs[bounds[2 * k]:bounds[2 * k + 1]], pairs[bounds[2 * k + 1]:bounds[2 * k + 2]]] if moved else []
+                 for k, moved in enumerate(routed.tolist())]
 
-        return swaps_count, swaps
\ No newline at end of file
+        return len(pairs), swaps
@@ -0,0 +1,162 @@
+"""
+Compiled version of the routing loop of Router.
+
+The kernel reproduces, CNOT by CNOT, what Router does in Python: adjacency check, shortest path
+reconstruction, choice of the qubit(s) to move by lookahead, and swaps application. It works on
+int32 arrays only, so that Numba can compile it, and explores the BFS tree towards a node the first
+time a path to that node is needed.
+
+Router uses the kernel when Numba is available, DEBUG logging is disabled (as in apply_routing) and
+there are at least KERNEL_MIN_CNOTS CNOTs to route: importing this module imports Numba and loads (or,
+the first time, compiles) the kernel, which smaller circuits do not repay. Random choices inside the kernel come from Numba's own generator, which is not
+affected by random.seed or np.random.seed. Router seeds it with a value drawn from the random module,
+the only source of randomness of the routing, whenever a random choice can happen (see route_cnots).
+"""
+
+import numpy as np
+from router.utils.jit import njit
+from router.utils.UnweightedUndirectedGraph import INF, _fill_path as _fill_path_python
+
+_fill_path = njit(cache=True)(_fill_path_python)
+
+# Side of a CNOT a swap belongs to, stored in the second column of the swaps array
+CONTROL_SIDE = 0
+TARGET_SIDE = 1
+
+@njit(cache=True)
+def _explore(root, indptr, indices, dist, next_node, explored):
+    """
+    BFS towards root: fills dist[root, u] and next_node[root, u] (the node after u on a shortest path to root).
+    Among the neighbours of u one step closer to root, next_node[root, u] is the lowest one.
+    """
+    if explored[root]:
+        return
+    queue = np.empty(indptr.shape[0] - 1, dtype=np.int32)
+    queue[0] = root
+    head, tail = 0, 1
+    dist[root, root] = 0
+    while head < tail:
+        u = queue[head]
+        head += 1
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if dist[root, v] == INF:
+                dist[root, v] = dist[root, u] + 1
+                next_node[root, v] = u
+                queue[tail] = v
+                tail += 1
+            elif dist[root, v] == dist[root, u] + 1 and u < next_node[root, v]:
+                next_node[root, v] = u  # Same tie break as UnweightedUndirectedGraph: lowest node one step closer
+    explored[root] = True
+
+@njit(cache=True)
+def _strategy(cnots, begin, lookahead, control, target):
+    """Same decision as Router.__swap_strategy_by_lookahead: the qubit to move, or -1 to move both."""
+    end = min(begin + lookahead, cnots.shape[0])
+    control_count = 0
+    target_count = 0
+    for k in range(begin, end):
+        if cnots[k, 0] == control or cnots[k, 1] == control:
+            control_count += 1
+        if cnots[k, 0] == target or cnots[k, 1] == target:
+            target_count += 1
+
+    if control_count == 0 and target_count == 0:
+        pick = np.random.randint(0, 3)
+        if pick == 0:
+            return control
+        if pick == 1:
+            return target
+        return -1
+    if control_count == 0 or control_count >= 2 * target_count:
+        return target
+    if target_count == 0 or target_count >= 2 * control_count:
+        return control
+    return -1
+
+@njit(cache=True)
+def _move(qubit, qubit_node, path, begin, end, backwards, l_to_p, p_to_l, swaps, count, cnot, side):
+    """Moves qubit through path[begin:end] (reversed if backwards), appending the swaps to the swaps array."""
+    for k in range(end - begin):
+        node = path[end - 1 - k] if backwards else path[begin + k]
+        swap_qubit = p_to_l[node]
+
+        # Grow the output array when full
+        if count == swaps.shape[0]:
+            larger = np.empty((2 * swaps.shape[0], 4), dtype=np.int32)
+            larger[:count] = swaps
+            swaps = larger
+        swaps[count, 0] = cnot
+        swaps[count, 1] = side
+        swaps[count, 2] = qubit
+        swaps[count, 3] = swap_qubit
+        count += 1
+
+        p_to_l[node] = qubit
+        p_to_l[qubit_node] = swap_qubit
+        l_to_p[qubit] = node
+        l_to_p[swap_qubit] = qubit_node
+        qubit_node = node
+    return swaps, count
+
+@njit(cache=True)
+def route_cnots(l_to_p, p_to_l, cnots, begins, m, lookahead, adj, indptr, indices, dist, next_node, explored, seed):
+    """
+    Routes the first m CNOTs, updating l_to_p and p_to_l in place.
+
+    Args:
+        l_to_p (np.ndarray): int32 logical to physical mapping.
+        p_to_l (np.ndarray): int32 physical to logical mapping.
+        cnots (np.ndarray): int32[k, 2] array of (control, target) pairs.
+        begins (np.ndarray): Index, in cnots, where the lookahead window of each CNOT starts.
+        m (int): Number of CNOTs to route.
+        lookahead (int): Number of CNOTs considered when deciding which qubit to move.
+        adj (np.ndarray): uint8 adjacency matrix of the topology.
+        indptr, indices (np.ndarray): CSR adjacency lists of the topology.
+        dist, next_node (np.ndarray): n x n BFS matrices, row r describes the BFS tree rooted in r.
+        explored (np.ndarray): explored[r] <-> row r of dist and next_node has been computed.
+        seed (int): Seed of the generator used for random strategy choices, only needed when some lookahead window
+            involves neither qubit of its CNOT. When compiled, it seeds Numba's generator; when run as plain Python
+            (Numba not installed), it reseeds NumPy's global generator.
+
+    Returns:
+        tuple: An int32[s, 4] array with a row (cnot index, side, qubit, swapped qubit) per swap, where side is
+            CONTROL_SIDE or TARGET_SIDE, and a boolean array telling which CNOTs required moving the qubits.
+    """
+    np.random.seed(seed)
+    swaps = np.empty((max(m, 16), 4), dtype=np.int32)
+    count = 0
+    routed = np.zeros(m, dtype=np.bool_)
+    path = np.empty(adj.shape[0], dtype=np.int32)
+
+    for i in range(m):
+        control = cnots[i, 0]
+        target = cnots[i, 1]
+        control_node = l_to_p[control]
+        target_node = l_to_p[target]
+
+        if adj[control_node, target_node] == 1:
+            continue
+        routed[i] = True
+
+        _explore(target_node, indptr, indices, dist, next_node, explored)
+        edges = dist[target_node, control_node]
+        if edges >= INF:
+            continue  # No path exists
+
+        # Shortest path from control_node to target_node, both included
+        _fill_path(control_node, edges, next_node[target_node], path)
+        nodes = edges + 1
+
+        strategy = _strategy(cnots, begins[i], lookahead, control, target)
+        if strategy == -1:
+            # Control goes through path[1:split], target backwards through path[split:nodes - 1]
+            split = (edges >> 1) + 1
+            swaps, count = _move(control, control_node, path, 1, split, False, l_to_p, p_to_l, swaps, count, i, CONTROL_SIDE)
+            swaps, count = _move(target, target_node, path, split, nodes - 1, True, l_to_p, p_to_l, swaps, count, i, TARGET_SIDE)
+        elif strategy == control:
+            swaps, count = _move(control, control_node, path, 1, nodes - 1, False, l_to_p, p_to_l, swaps, count, i, CONTROL_SIDE)
+        else:
+            swaps, count = _move(target, target_node, path, 1, nodes - 1, True, l_to_p, p_to_l, swaps, count, i, TARGET_SIDE)
+
+    return swaps[:count], routed
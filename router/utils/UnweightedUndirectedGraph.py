@@ -1,61 +1,141 @@
 import networkx as nx
+import numpy as np
+
+# Distance between disconnected nodes. Small enough that INF + INF still fits in an int32
+INF = 10**6
+# Little-endian words, so that the bytes of a bit row unpack (with bitorder="little") in node order
+BIT_ROW = np.dtype("<u8")
+
+def _fill_path(start, edges, next_node, path):
+    """
+    Writes in path[:edges + 1] the path of the given number of edges from start, following next_node towards the root.
+    Runs as plain Python here, paths being short and cached, and is compiled by the routing kernel.
+    """
+    path[0] = start
+    for k in range(edges):
+        path[k + 1] = next_node[path[k]]
 
 class UnweightedUndirectedGraph:
     def __init__(self, num_nodes):
         """Initialize the graph with a fixed number of nodes."""
         self.num_nodes = num_nodes
-        self.adj_matrix = [[0] * num_nodes for _ in range(num_nodes)]  # Adjacency matrix
-        self.dist = None  # Distance matrix (for Floyd-Warshall)
-        self.next_node = None  # Matrix to reconstruct shortest paths
+        self.adj_matrix = np.zeros((num_nodes, num_nodes), dtype=np.uint8)  # Adjacency matrix
+        # Bit-packed adjacency matrix: bit v & 63 of bits[u, v >> 6] is set <-> u and v are adjacent
+        self.bits = np.zeros((num_nodes, (num_nodes + 63) >> 6), dtype=BIT_ROW)
+        self.neighbours = [[] for _ in range(num_nodes)]  # Adjacency lists, used by the compiled routing kernel
+        self.bfs_trees = {}  # root -> (distances to root, next node towards root), computed on demand
+        self.path_cache = {}  # (start, end) -> shortest path from start to end, as a tuple of nodes
+        self.routing_arrays = None  # Arrays used by the compiled routing kernel, built on demand
+        self.shared = False  # Whether the graph is shared by several routers, in which case it can no longer be modified
 
     def from_nx(self, graph: nx.Graph):
-        for (s, d) in graph.edges:
-            self.add_edge(s, d)
+        """Add all of the edges of graph, scattering them at once into the adjacency structures."""
+        self.from_edges(list(graph.edges))
+
+    def from_edges(self, edges):
+        """Add all of the given (u, v) edges, scattering them at once into the adjacency structures."""
+        self.__check_not_shared()
+        edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        self.adj_matrix[edges[:, 0], edges[:, 1]] = 1
+        self.adj_matrix[edges[:, 1], edges[:, 0]] = 1
+
+        # Rebuild the bit rows and the adjacency lists from the adjacency matrix
+        packed = np.zeros((self.num_nodes, self.bits.shape[1] * BIT_ROW.itemsize), dtype=np.uint8)
+        packed[:, :(self.num_nodes + 7) >> 3] = np.packbits(self.adj_matrix, axis=1, bitorder="little")
+        self.bits = packed.view(BIT_ROW)
+        self.neighbours = [np.flatnonzero(row).tolist() for row in self.adj_matrix]
+
+        self.bfs_trees.clear()  # Previously computed trees and paths may not be shortest anymore
+        self.path_cache.clear()
+        self.routing_arrays = None
 
     def add_edge(self, u, v):
         """Add an edge between nodes u and v."""
-        self.adj_matrix[u][v] = 1
-        self.adj_matrix[v][u] = 1
+        self.__check_not_shared()
+        if not self.are_adjacent(u, v):
+            self.neighbours[u].append(v)
+            self.neighbours[v].append(u)
+        self.adj_matrix[u, v] = 1
+        self.adj_matrix[v, u] = 1
+        self.bits[u, v >> 6] |= np.uint64(1) << np.uint64(v & 63)
+        self.bits[v, u >> 6] |= np.uint64(1) << np.uint64(u & 63)
+        self.bfs_trees.clear()  # Previously computed trees and paths may not be shortest anymore
+        self.path_cache.clear()
+        self.routing_arrays = None
+
+    def __check_not_shared(self):
+        """Raise an error if the graph is shared: changing it would silently change every router using it."""
+        if self.shared:
+            raise RuntimeError("Cannot modify a graph shared by the routers of a topology: build a new UnweightedUndirectedGraph instead")
+
+    def __bfs_tree(self, root):
+        """Return the BFS tree rooted in root as (dist, next_node) arrays, computing it on first use."""
+        tree = self.bfs_trees.get(root)
+        if tree is not None:
+            return tree
 
-    def floyd_warshall(self):
-        """Compute shortest paths between all pairs of nodes using Floyd-Warshall."""
         n = self.num_nodes
-        self.dist = [[float('inf')] * n for _ in range(n)]
-        self.next_node = [[-1] * n for _ in range(n)]
-
-        # Initialize distances and next_node from adjacency matrix
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    self.dist[i][j] = 0
-                elif self.adj_matrix[i][j] == 1:
-                    self.dist[i][j] = 1
-                    self.next_node[i][j] = j
-
-        # Floyd-Warshall algorithm
-        for k in range(n):
-            for i in range(n):
-                for j in range(n):
-                    if self.dist[i][j] > self.dist[i][k] + self.dist[k][j]:
-                        self.dist[i][j] = self.dist[i][k] + self.dist[k][j]
-                        self.next_node[i][j] = self.next_node[i][k]
+        dist = np.full(n, INF, dtype=np.int32)  # dist[u] = length of the shortest path from u to root
+        next_node = np.full(n, -1, dtype=np.int32)  # next_node[u] = node following u on a shortest path to root
+        dist[root] = 0
+
+        # Visited nodes and current level of the search, as bit rows
+        visited = np.zeros(self.bits.shape[1], dtype=BIT_ROW)
+        visited[root >> 6] = np.uint64(1) << np.uint64(root & 63)
+        frontier = np.array([root])
+        level = 0
+        while frontier.size > 0:
+            level += 1
+            # Nodes adjacent to the frontier and not visited yet form the next level
+            reached = np.bitwise_or.reduce(self.bits[frontier], axis=0) & ~visited
+            visited |= reached
+            new_nodes = np.flatnonzero(np.unpackbits(reached.view(np.uint8), bitorder="little")[:n])
+            dist[new_nodes] = level
+            # Each new node steps towards root through its first (lowest) neighbour in the frontier
+            next_node[new_nodes] = frontier[np.argmax(self.adj_matrix[np.ix_(new_nodes, frontier)], axis=1)]
+            frontier = new_nodes
+
+        tree = (dist, next_node)
+        self.bfs_trees[root] = tree
+        return tree
+
+    def get_routing_arrays(self):
+        """
+        Return the arrays used by the compiled routing kernel: the CSR adjacency lists (indptr, indices) and the
+        n x n BFS matrices (dist, next_node, explored), whose rows are filled by the kernel the first time they are needed.
+        """
+        if self.routing_arrays is None:
+            n = self.num_nodes
+            indptr = np.zeros(n + 1, dtype=np.int32)
+            indptr[1:] = np.cumsum([len(neighbours) for neighbours in self.neighbours])
+            indices = np.array([v for neighbours in self.neighbours for v in neighbours], dtype=np.int32)
+            dist = np.full((n, n), INF, dtype=np.int32)
+            next_node = np.full((n, n), -1, dtype=np.int32)
+            explored = np.zeros(n, dtype=np.bool_)
+            self.routing_arrays = (indptr, indices, dist, next_node, explored)
+        return self.routing_arrays
 
     def are_adjacent(self, u, v):
         """Check if nodes u and v are adjacent."""
-        return self.adj_matrix[u][v] == 1
+        return bool(self.bits[u, v >> 6] >> np.uint64(v & 63) & np.uint64(1))
 
     def get_shortest_path(self, start, end):
-        """Reconstruct and return the shortest path from start to end."""
-        if self.dist is None or self.next_node is None:
-            raise ValueError("Floyd-Warshall must be run first to compute shortest paths.")
-
-        if self.dist[start][end] == float('inf'):
-            return []  # No path exists
-
-        path = [start]
-        while start != end:
-            start = self.next_node[start][end]
-            if start == -1:
-                return []  # No path exists
-            path.append(start)
-        return path
\ No newline at end of file
+        """Reconstruct and return the shortest path from start to end, as a tuple of nodes (empty if there is none)."""
+        path = self.path_cache.get((start, end))
+        if path is not None:
+            return path
+
+        # The BFS tree rooted in end gives, for every node, the next step towards end
+        dist, next_node = self.__bfs_tree(end)
+
+        if dist[start] >= INF:
+            path = ()  # No path exists
+        else:
+            # The path has exactly dist[start] + 1 nodes
+            edges = int(dist[start])
+            path = np.empty(edges + 1, dtype=np.int32)
+            _fill_path(start, edges, next_node, path)
+            path = tuple(path.tolist())
+
+        self.path_cache[(start, end)] = path
+        return path
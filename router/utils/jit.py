@@ -0,0 +1,20 @@
+"""
+Optional Numba support.
+
+Numba is not a requirement of the project: when it is not installed, `njit` leaves the decorated
+functions untouched and `HAS_NUMBA` is False, so that callers can keep running them as plain Python.
+Numba is only imported when a function is decorated, so importing this module stays cheap.
+"""
+
+from importlib.util import find_spec
+
+HAS_NUMBA = find_spec("numba") is not None
+
+def njit(*args, **kwargs):
+    """numba.njit when Numba is installed, otherwise a no-op. Usable both as @njit and as @njit(...)."""
+    if HAS_NUMBA:
+        from numba import njit as numba_njit
+        return numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda function: function
@@ -1,15 +1,26 @@
 import pennylane as qml
+import numpy as np
 from pennylane.tape import QuantumTape
 import networkx as nx
 from mapper.base import MapperType, MapperUpdater
 from router import Router
 from math import log2
 import logging
+from functools import lru_cache
+from itertools import combinations
 from time import time_ns
 
 # Setup logger for logging routing information to a file
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _configure_logging():
+    """
+    Initializes the log file for the routing procedure, with a timestamp.
+    Cached, so that the configuration only happens on the first routing of the process.
+    """
+    logging.basicConfig(filename='log/routing_transformation_' + str(time_ns())  + '.log', level=logging.INFO)
+
 # Because of the explanation given in the following error:
 # pennylane.transforms.core.transform_dispatcher.TransformError: Decorating a QNode with @transform_fn(**transform_kwargs) has been removed. Please decorate with @functools.partial(transform_fn, **transform_kwargs) instead, or call the transform directly using qnode = transform_fn(qnode, **transform_kwargs). 
 # I just called the method apply_routing (is suggested by the error string)
@@ -32,8 +43,8 @@ def apply_routing(tape: QuantumTape, connectivity: nx.Graph, mapper_type: str):
             - measurements (list): List of measurements in the tape.
             - logical_qubits (int): Number of logical qubits.
     """
-    # Initialize the log file for the routing procedure with a timestamp
-    logging.basicConfig(filename='log/routing_transformation_' + str(time_ns())  + '.log', level=logging.INFO)
+    # Initialize the log file for the routing procedure (only once)
+    _configure_logging()
     logger.info("Starting routing procedure")
     
     # Initialize a list to store new operations with swaps
@@ -93,20 +104,23 @@ def get_interaction_list(tape):
         tape (QuantumTape): The quantum tape representing the quantum circuit.
     
     Returns:
-        list: A list of tuples representing interacting qubit pairs and their operation index.
+        list: A list of tuples representing interacting qubit pairs and their index. The index counts pairs, not operations,
+            so it only matches the operation index when every multi-qubit operation acts on two qubits.
     """
     interaction_list = []
-    op_count = 0  # Operation counter
+    op_count = 0  # Pair counter: operations acting on k qubits take up k(k-1)/2 consecutive indices
     # Iterate through the operations in the tape
     for op in tape.operations:
         wires = op.wires
-        # Only consider operations with at least two qubits (CNOT operations)
-        if len(wires) >= 2:
-            # Add all pairs of interacting qubits to the interaction list
-            for i in range(len(wires)):
-                for j in range(i + 1, len(wires)):
-                    interaction_list.append((wires[i], wires[j], op_count))
-                    op_count += 1
+        # Two-qubit operations (CNOTs) give a single pair
+        if len(wires) == 2:
+            interaction_list.append((wires[0], wires[1], op_count))
+            op_count += 1
+        # Wider operations add all pairs of interacting qubits to the interaction list
+        elif len(wires) > 2:
+            for (i, j) in combinations(wires, 2):
+                interaction_list.append((i, j, op_count))
+                op_count += 1
 
     return interaction_list
 
@@ -126,43 +140,35 @@ def __update_circuit(tape, swaps, qubits):
         list: A list of updated quantum operations with the SWAP operations applied.
     """
     new_ops = []  # List to store new operations with swaps
-    current_wires = {i : i for i in range(qubits)}  # Mapping from logical qubits to physical qubits
+    current_wires = np.arange(qubits, dtype=np.int32)  # current_wires[q] = physical qubit hosting logical qubit q
+    swaps_iter = iter(swaps)  # Swaps of the next multi-qubit operation
+    SWAP = qml.SWAP  # Looked up once, instead of once per swap
 
     # Iterate through the operations in the tape
     for op in tape.operations:
         wires = op.wires
         # If the operation involves only one qubit, update its mapping directly
         if len(wires) == 1:
-            op = qml.map_wires(op, current_wires)
+            op = op.map_wires({w: int(current_wires[w]) for w in wires})
             new_ops.append(op)
         else:
             # For multi-qubit operations (CNOTs), apply the necessary swaps
-            swaps_for_current_operation = swaps[0]  # Get the swaps for this operation
-            swaps = swaps[1:]  # Remove the first swap entry from the list
+            swaps_for_current_operation = next(swaps_iter)  # Get the swaps for this operation
             
             if len(swaps_for_current_operation) != 0:
-                # Apply SWAP operations for both control and target qubits
-                control_movements = swaps_for_current_operation[0]
-                target_movements = swaps_for_current_operation[1]
-
-                # Apply SWAP operations for control qubits
-                for (q1, q2) in control_movements:
-                    new_ops.append(qml.SWAP(wires=[current_wires[q1], current_wires[q2]]))
-                    # Update the qubit mapping after the swap
-                    aux = current_wires[q1]
-                    current_wires[q1] = current_wires[q2]
-                    current_wires[q2] = aux
-
-                # Apply SWAP operations for target qubits
-                for (q1, q2) in target_movements:
-                    new_ops.append(qml.SWAP(wires=[current_wires[q1], current_wires[q2]]))
-                    # Update the qubit mapping after the swap
-                    aux = current_wires[q1]
-                    current_wires[q1] = current_wires[q2]
-                    current_wires[q2] = aux
+                # Physical wires of the SWAP operations, first for the control qubit and then for the target one
+                swap_wires = []
+                for movements in swaps_for_current_operation:
+                    for (q1, q2) in movements:
+                        swap_wires.append([int(current_wires[q1]), int(current_wires[q2])])
+                        # Update the qubit mapping after the swap
+                        current_wires[q1], current_wires[q2] = current_wires[q2], current_wires[q1]
+
+                # Apply all of the SWAP operations at once
+                new_ops.extend(SWAP(wires=pair) for pair in swap_wires)
 
             # Apply the operation with the updated wire mapping
-            op = qml.map_wires(op, current_wires)
+            op = op.map_wires({w: int(current_wires[w]) for w in wires})
             new_ops.append(op)
 
     return new_ops
\ No newline at end of file